@@ -1,107 +1,268 @@
 """
 Configuration loader for the Galaxy SIA Server.
 
-Reads and validates settings from 'sia-server.conf' and 'defaults.py',
-and provides them as clean Python objects to the main application.
+Reads and validates settings from 'sia-server.conf', falling back to the defaults
+declared on AppConfig, and provides them as clean Python objects to the main application.
 """
 
-import configparser
+from __future__ import annotations
+
+import base64
 import logging
 import logging.handlers
 import sys
-import re
-from galaxy.constants import UNKNOWN_CHAR_MAP
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # configparser is only imported when load_and_validate_config() parses the file,
+    # importing this module alone does not load it.
+    import configparser
 
 log = logging.getLogger(__name__)
 
+CONFIG_FILE = 'sia-server.conf'
+# Sections holding server settings. Every other section is an account (or [Default]).
+SYSTEM_SECTIONS = frozenset({'SIA-Server', 'IP-Check', 'Logging', 'Notification'})
+
+def _default_byte_translate_table() -> bytes:
+    """The built-in BYTE_TRANSLATE_TABLE, imported only when an AppConfig is actually built."""
+    from galaxy.constants import BYTE_TRANSLATE_TABLE
+    return BYTE_TRANSLATE_TABLE
+
+@dataclass(frozen=True, slots=True)
 class AppConfig:
-    """A simple class to hold the final, validated configuration."""
+    """The final, validated configuration. Built once at startup and read-only afterwards."""
+    # --- Settings from sia-server.conf ---
+    LISTEN_ADDR: str = '0.0.0.0'
+    LISTEN_PORT: int = 10000
+    IP_CHECK_ENABLED: bool = False
+    IP_CHECK_ADDR: str = '0.0.0.0'
+    IP_CHECK_PORT: int = 10001
+    LOG_LEVEL: str = 'INFO'
+    LOG_TO_FILE: bool = False
+    LOG_TO_SYSLOG: bool = False
+    LOG_FILE: str | None = None
+    SYSLOG_SOCKET: str = '/dev/log'
+    SYSLOG_FACILITY: int = logging.handlers.SysLogHandler.LOG_USER
+    ACCOUNT_SITES: dict = field(default_factory=dict)
+    NTFY_TOPICS: dict = field(default_factory=dict)
+    # NTFY_TOPICS flattened for the notification hot path: account -> (url, title, auth_header)
+    NTFY_DISPATCH: dict = field(default_factory=dict)
+    MAX_QUEUE_SIZE: int = 50
+    MAX_RETRIES: int = 10
+    MAX_RETRY_TIME: int = 30
+    LOG_MAX_MB: int = 10
+    LOG_BACKUP_COUNT: int = 5
+    EVENT_PRIORITIES: dict = field(default_factory=dict)
+    DEFAULT_PRIORITY: int = 5
+    # EVENT_PRIORITIES flattened into a 26*26 table indexed by the two event code letters.
+    EVENT_PRIORITY_LUT: tuple = (5,) * (26 * 26)
+    # --- Advanced / Constant Defaults ---
+    BYTE_TRANSLATE_TABLE: bytes = field(default_factory=_default_byte_translate_table)
+    LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+    # For Syslog, we want a simpler format without the timestamp, as syslog adds its own:
+    SYSLOG_FORMAT: str = 'SIA-Server: %(levelname)s - %(message)s'
+
+class _AppConfigBuilder:
+    """Mutable scratch copy of AppConfig, filled in while the config file is validated."""
     def __init__(self):
-        # --- Settings from sia-server.conf ---
-        self.LISTEN_ADDR = '0.0.0.0'
-        self.LISTEN_PORT = 10000
-        self.IP_CHECK_ENABLED = False
-        self.IP_CHECK_ADDR = '0.0.0.0'
-        self.IP_CHECK_PORT = 10001
-        self.LOG_LEVEL = 'INFO'
-        self.LOG_TO_FILE = False
-        self.LOG_TO_SYSLOG = False
-        self.LOG_FILE = None
-        self.SYSLOG_SOCKET = '/dev/log'
-        self.SYSLOG_FACILITY = logging.handlers.SysLogHandler.LOG_USER
-        self.ACCOUNT_SITES = {}
-        self.NTFY_TOPICS = {}
-        self.MAX_QUEUE_SIZE = 50
-        self.MAX_RETRIES = 10
-        self.MAX_RETRY_TIME = 30
-        self.LOG_MAX_MB = 10
-        self.LOG_BACKUP_COUNT = 5
-        self.EVENT_PRIORITIES = {}
-        self.DEFAULT_PRIORITY = 5
-        # --- Advanced / Constant Defaults ---
-        self.UNKNOWN_CHAR_MAP = UNKNOWN_CHAR_MAP
-        self.LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        self.LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
-        # For Syslog, we want a simpler format without the timestamp, as syslog adds its own:
-        self.SYSLOG_FORMAT = 'SIA-Server: %(levelname)s - %(message)s' 
+        defaults = AppConfig()
+        for f in fields(AppConfig):
+            setattr(self, f.name, getattr(defaults, f.name))
+
+    def build(self) -> AppConfig:
+        """Freezes the collected settings into the final AppConfig."""
+        return AppConfig(**self.__dict__)
+
+# Valid and privileged (root-only) port numbers. Membership in a range is a constant-time check.
+_VALID_PORTS = range(1, 65536)
+_PRIVILEGED_PORTS = range(1, 1024)
 
 def _validate_port(port: int, section: str, key: str) -> bool:
     """Helper function to validate a port number."""
-    if not 1 <= port <= 65535:
+    if port not in _VALID_PORTS:
         log.critical("Configuration Error in section [%s]: %s must be between 1 and 65535, but got %d.",
                      section, key, port)
         return False
-    if port < 1024:
+    if port in _PRIVILEGED_PORTS:
         # It's not a fatal error, but it requires special permissions. Warn the user.
         log.warning("Configuration Info in section [%s]: The port %d is a 'privileged' port (< 1024). "
                     "This may require running the server as a root user.", section, port)
     return True
 
-def _parse_topic_config(config: configparser.ConfigParser, section_name: str) -> dict | None:
-    """Helper function to parse notification settings for a given section."""
+def _strip_inline_comment(line: str) -> str:
+    """
+    Removes an inline '#' or ';' comment from a config line. Like ConfigParser's
+    inline_comment_prefixes, the prefix must follow whitespace, so a '#' inside a
+    URL or token is kept.
+    """
+    end = len(line)
+    for prefix in (' #', '\t#', ' ;', '\t;'):
+        index = line.find(prefix, 0, end)
+        if index != -1:
+            end = index
+    if end == len(line):
+        return line
+    return line[:end].rstrip() + '\n'
+
+def _bounded_int(options: dict, key: str, default: int, low: int, high: int | None = None) -> int:
+    """
+    Reads an integer option from a section snapshot and checks it is within [low, high]
+    (no upper limit if high is None). Invalid values log a warning and return the default.
+    """
+    try:
+        value = _get_int(options, key, default)
+    except ValueError:
+        log.warning("Invalid %s '%s'. Must be a number. Using default %d.", key.upper(), options[key], default)
+        return default
+    if value < low or (high is not None and value > high):
+        if high is None:
+            log.warning("Invalid %s '%d'. Must be at least %d. Using default %d.", key.upper(), value, low, default)
+        else:
+            log.warning("Invalid %s '%d'. Must be between %d and %d. Using default %d.", key.upper(), value, low, high, default)
+        return default
+    return value
+
+def _section_options(config: configparser.ConfigParser, section_name: str) -> dict:
+    """Snapshots a section into a plain dict once, instead of a config.get() per option."""
+    if not config.has_section(section_name):
+        return {}
+    return dict(config.items(section_name))
+
+# The same yes/no values ConfigParser.getboolean() accepts.
+_TRUE = frozenset({'1', 'yes', 'true', 'on'})
+_FALSE = frozenset({'0', 'no', 'false', 'off'})
+
+def _get_bool(options: dict, key: str, fallback: bool = False) -> bool:
+    """Reads a boolean option from a section snapshot."""
+    value = options.get(key)
+    if value is None:
+        return fallback
+    normalized = value.strip().lower()
+    if normalized in _TRUE:
+        return True
+    if normalized in _FALSE:
+        return False
+    log.warning("Invalid yes/no value '%s' for %s. Using default '%s'.", value, key.upper(), 'Yes' if fallback else 'No')
+    return fallback
+
+def _get_int(options: dict, key: str, fallback: int) -> int:
+    """Reads an integer option from a section snapshot. Raises ValueError if not a number."""
+    value = options.get(key)
+    if value is None:
+        return fallback
+    return int(value)
+
+def _parse_token_auth(options: dict, section_name: str) -> dict | None:
+    """Parses NTFY_AUTH = Token settings for a given section."""
+    token = options.get('ntfy_token')
+    if token:
+        return {'method': 'token', 'token': token}
+    log.warning("In section [%s], auth is 'Token' but 'ntfy_token' is missing. Auth will be disabled.", section_name)
+    return None
+
+def _parse_userpass_auth(options: dict, section_name: str) -> dict | None:
+    """Parses NTFY_AUTH = Userpass settings for a given section."""
+    user = options.get('ntfy_user')
+    password = options.get('ntfy_pass')
+    if user and password:
+        return {'method': 'userpass', 'user': user, 'pass': password}
+    log.warning("In section [%s], auth is 'Userpass' but user/pass is incomplete. Auth will be disabled.", section_name)
+    return None
+
+# Maps the (lowercased) NTFY_AUTH value to the function that parses its settings.
+_AUTH_PARSERS = {
+    'none': lambda options, section_name: None,
+    'token': _parse_token_auth,
+    'userpass': _parse_userpass_auth,
+}
+
+def _parse_topic_config(options: dict, section_name: str) -> dict | None:
+    """
+    Helper function to parse notification settings from a section's options snapshot.
+    Only called for sections with NTFY_ENABLED = Yes.
+    """
     
-    # Rule 2: If NTFY_ENABLED is missing or No, or if NTFY_TOPIC is missing, disable.
-    if not config.getboolean(section_name, 'ntfy_enabled', fallback=False):
-        return None
-    if not config.has_option(section_name, 'ntfy_topic'):
+    # Rule 2: If NTFY_TOPIC is missing, disable.
+    if 'ntfy_topic' not in options:
         log.warning("Section [%s] has NTFY_ENABLED=Yes but is missing NTFY_TOPIC. Notifications for this section will be disabled.", section_name)
         return None
         
     topic_config = {'enabled': True}
-    topic_config['url'] = config.get(section_name, 'ntfy_topic')
-    topic_config['title'] = config.get(section_name, 'ntfy_title', fallback='Galaxy Alarm')
+    topic_config['url'] = options['ntfy_topic']
+    topic_config['title'] = options.get('ntfy_title', 'Galaxy Alarm')
     
     # Rule 3: If NTFY_AUTH is missing, default to None.
-    auth_method = config.get(section_name, 'ntfy_auth', fallback='None').lower()
-    
-    if auth_method == 'token':
-        token = config.get(section_name, 'ntfy_token', fallback=None)
-        if token:
-            topic_config['auth'] = {'method': 'token', 'token': token}
-        else:
-            log.warning("In section [%s], auth is 'Token' but 'ntfy_token' is missing. Auth will be disabled.", section_name)
-    elif auth_method == 'userpass':
-        user = config.get(section_name, 'ntfy_user', fallback=None)
-        password = config.get(section_name, 'ntfy_pass', fallback=None)
-        if user and password:
-            topic_config['auth'] = {'method': 'userpass', 'user': user, 'pass': password}
-        else:
-            log.warning("In section [%s], auth is 'Userpass' but user/pass is incomplete. Auth will be disabled.", section_name)
+    # Most sections leave it unset, so skip lowercasing for the default value.
+    auth_method = options.get('ntfy_auth')
+    auth_method = 'none' if auth_method in (None, 'None', 'none') else auth_method.lower()
+    auth_parser = _AUTH_PARSERS.get(auth_method)
+    if auth_parser is None:
+        log.warning("In section [%s], unknown NTFY_AUTH '%s'. Auth will be disabled.", section_name, auth_method)
+        return topic_config
+
+    auth = auth_parser(options, section_name)
+    if auth:
+        topic_config['auth'] = auth
             
     return topic_config
 
 
+def _build_dispatch_entry(topic_config: dict) -> tuple[str, str, str | None]:
+    """
+    Flattens a parsed topic config into a (url, title, auth_header) tuple, with the
+    finished HTTP Authorization header so it is not rebuilt for every notification.
+    """
+    auth_header = None
+    auth = topic_config.get('auth')
+    if auth and auth['method'] == 'token':
+        auth_header = f"Bearer {auth['token']}"
+    elif auth and auth['method'] == 'userpass':
+        credentials = f"{auth['user']}:{auth['pass']}".encode('utf-8')
+        auth_header = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+    return (topic_config['url'], topic_config['title'], auth_header)
+
+def _build_priority_lut(priority_map: dict, default_priority: int) -> tuple[int, ...]:
+    """
+    Flattens the event code -> priority map into a 26*26 tuple, so a priority lookup
+    is a single index: (ord(code[0]) - 65) * 26 + (ord(code[1]) - 65).
+    """
+    table = [default_priority] * (26 * 26)
+    for code, priority in priority_map.items():
+        table[(ord(code[0]) - 65) * 26 + (ord(code[1]) - 65)] = priority
+    return tuple(table)
+
+
+@lru_cache(maxsize=1)
 def load_and_validate_config() -> AppConfig:
     """
     Reads sia-server.conf, validates its contents, and returns a final
-    AppConfig object.
+    AppConfig object. The result is cached, so the file is only parsed once.
     """
-    config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
-    if not config.read('sia-server.conf'):
+    import configparser
+
+    # Read the whole file once. Always as UTF-8 (a BOM, as added by some Windows editors,
+    # is skipped), instead of the platform's locale encoding ConfigParser.read() would use.
+    try:
+        with open(CONFIG_FILE, encoding='utf-8-sig') as f:
+            lines = f.read().splitlines(keepends=True)
+    except OSError:
         log.critical("Configuration Error: The 'sia-server.conf' file was not found or is empty.")
         sys.exit(1)
+    except UnicodeDecodeError as e:
+        log.critical("Configuration Error: The 'sia-server.conf' file is not valid UTF-8 (%s). Please save it as UTF-8.", e)
+        sys.exit(1)
+
+    # Interpolation is disabled: we never use %(name)s references, and it would both slow
+    # down every get() and break on a literal '%' in a token or password.
+    # Inline comments are already stripped, so ConfigParser does not have to scan for them.
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_string(''.join(_strip_inline_comment(line) for line in lines), CONFIG_FILE)
     
-    app_config = AppConfig()
+    app_config = _AppConfigBuilder()
     is_valid = True
 
      # --- Validate and load [SIA-Server] section ---
@@ -109,9 +270,10 @@ def load_and_validate_config() -> AppConfig:
         log.critical("Configuration error: [SIA-Server] section is missing in sia-server.conf")
         is_valid = False
         
+    sia_options = _section_options(config, 'SIA-Server')
     try:
-        app_config.LISTEN_ADDR = config.get('SIA-Server', 'listen_addr', fallback='0.0.0.0')
-        sia_port = config.getint('SIA-Server', 'listen_port', fallback=10000)
+        app_config.LISTEN_ADDR = sia_options.get('listen_addr', '0.0.0.0')
+        sia_port = _get_int(sia_options, 'listen_port', 10000)
         if _validate_port(sia_port, 'SIA-Server', 'listen_port'):
             app_config.LISTEN_PORT = sia_port
         else:
@@ -122,11 +284,12 @@ def load_and_validate_config() -> AppConfig:
 
     # --- Validate and load [IP-Check] section ---
     if config.has_section('IP-Check'):
-        if config.getboolean('IP-Check', 'enabled', fallback=False):
+        ip_check_options = _section_options(config, 'IP-Check')
+        if _get_bool(ip_check_options, 'enabled'):
             app_config.IP_CHECK_ENABLED = True
-            app_config.IP_CHECK_ADDR = config.get('IP-Check', 'listen_addr', fallback='0.0.0.0')
+            app_config.IP_CHECK_ADDR = ip_check_options.get('listen_addr', '0.0.0.0')
             try:
-                ip_check_port = config.getint('IP-Check', 'listen_port', fallback=10001)
+                ip_check_port = _get_int(ip_check_options, 'listen_port', 10001)
                 if _validate_port(ip_check_port, 'IP-Check', 'listen_port'):
                     app_config.IP_CHECK_PORT = ip_check_port
                 else:
@@ -142,18 +305,19 @@ def load_and_validate_config() -> AppConfig:
 
     # --- Validate and load [Logging] section
     if config.has_section('Logging'):
-        app_config.LOG_LEVEL = config.get('Logging', 'log_level', fallback='INFO').upper()
+        logging_options = _section_options(config, 'Logging')
+        app_config.LOG_LEVEL = logging_options.get('log_level', 'INFO').upper()
         # Read the user's choice for log destination
-        log_to = config.get('Logging', 'log_to', fallback='Screen').lower()
+        log_to = logging_options.get('log_to', 'Screen').lower()
         # Set the correct flags based on the choice
         app_config.LOG_TO_FILE = (log_to == 'file')
         app_config.LOG_TO_SYSLOG = (log_to == 'syslog')
         
         # Parse advanced syslog settings if Syslog is enabled ---
         if app_config.LOG_TO_SYSLOG:
-            app_config.SYSLOG_SOCKET = config.get('Logging', 'syslog_socket', fallback='/dev/log')
+            app_config.SYSLOG_SOCKET = logging_options.get('syslog_socket', '/dev/log')
             
-            facility_str = config.get('Logging', 'syslog_facility', fallback='user').lower()
+            facility_str = logging_options.get('syslog_facility', 'user').lower()
             facility_map = {
                 'user': logging.handlers.SysLogHandler.LOG_USER,
                 'daemon': logging.handlers.SysLogHandler.LOG_DAEMON,
@@ -174,99 +338,79 @@ def load_and_validate_config() -> AppConfig:
         
         # Handle file-specific settings only if file logging is enabled
         if app_config.LOG_TO_FILE:
-            app_config.LOG_FILE = config.get('Logging', 'log_file', fallback=None)
+            app_config.LOG_FILE = logging_options.get('log_file')
             if not app_config.LOG_FILE:
                 log.warning("LOG_TO is set to File, but no LOG_FILE was specified. Logging to screen instead.")
                 app_config.LOG_TO_FILE = False
             # Parse and validate the log rotation settings
-            try:
-                max_mb = config.getint('Logging', 'log_max_mb', fallback=10)
-                if 1 <= max_mb <= 100:
-                    app_config.LOG_MAX_MB = max_mb
-                else:
-                    log.warning("Invalid LOG_MAX_MB '%d'. Must be between 1 and 100. Using default 10.", max_mb)
-                
-                backup_count = config.getint('Logging', 'log_backup_count', fallback=5)
-                if 1 <= backup_count <= 10:
-                    app_config.LOG_BACKUP_COUNT = backup_count
-                else:
-                    log.warning("Invalid LOG_BACKUP_COUNT '%d'. Must be between 1 and 10. Using default 5.", backup_count)
-            except ValueError:
-                log.warning("Invalid number in [Logging] for rotation settings. Using defaults.")
+            app_config.LOG_MAX_MB = _bounded_int(logging_options, 'log_max_mb', 10, 1, 100)
+            app_config.LOG_BACKUP_COUNT = _bounded_int(logging_options, 'log_backup_count', 5, 1, 10)
 
     # Validate and load [Notification] section ---
     if config.has_section('Notification'):
-        try:
-            app_config.MAX_QUEUE_SIZE = config.getint('Notification', 'max_que_size', fallback=50)
-            app_config.MAX_RETRIES = config.getint('Notification', 'max_retries', fallback=10)
-            app_config.MAX_RETRY_TIME = config.getint('Notification', 'max_retry_time', fallback=30)
-
-            # Add some validation for the ranges
-            if not 1 <= app_config.MAX_QUEUE_SIZE <= 1000:
-                log.warning("Invalid MAX_QUE_SIZE '%d'. Must be between 1 and 1000. Using default 50.", app_config.MAX_QUEUE_SIZE)
-                app_config.MAX_QUEUE_SIZE = 50
-            if app_config.MAX_RETRIES < 0:
-                log.warning("Invalid MAX_RETRIES '%d'. Cannot be negative. Using default 10.", app_config.MAX_RETRIES)
-                app_config.MAX_RETRIES = 10
-            if not 1 <= app_config.MAX_RETRY_TIME <= 1000:
-                log.warning("Invalid MAX_RETRY_TIME '%d'. Must be between 1 and 1000. Using default 30.", app_config.MAX_RETRY_TIME)
-                app_config.MAX_RETRY_TIME = 30
-
-            # Parsing EC Codes Notification Priorities:
-            event_priorities = {}
-            for i in range(1, 6): # Check for PRIORITY_1 through PRIORITY_5
-                key = f'priority_{i}'
-                # Get the string, falling back to empty if the key is missing
-                priority_str = config.get('Notification', key, fallback='')
-                # Split by commas OR spaces, and filter out any empty strings
-                codes = [code.strip().upper() for code in re.split(r'[, ]+', priority_str) if code.strip()]
-                
-                for code in codes:
-                    if len(code) == 2:
-                        if code in event_priorities:
-                            # The code already exists. Log a warning.
-                            old_priority = event_priorities[code]
-                            log.warning("Duplicate event code '%s' found in configuration. It was found in both PRIORITY_%d and in PRIORITY_%d. Using the highest priority (%d).",
-                                        code, old_priority, i, i)
-                        event_priorities[code] = i
-                    else:
-                        log.warning("In [Notification], ignoring invalid event code '%s' in %s. Codes must be 2 characters.", code, key.upper())
+        notification_options = _section_options(config, 'Notification')
+        app_config.MAX_QUEUE_SIZE = _bounded_int(notification_options, 'max_que_size', 50, 1, 1000)
+        app_config.MAX_RETRIES = _bounded_int(notification_options, 'max_retries', 10, 0)  # 0 = infinite
+        app_config.MAX_RETRY_TIME = _bounded_int(notification_options, 'max_retry_time', 30, 1, 1000)
+        app_config.DEFAULT_PRIORITY = _bounded_int(notification_options, 'default_priority', 5, 1, 5)
+
+        # Parsing EC Codes Notification Priorities:
+        event_priorities = {}
+        for i in range(1, 6): # Check for PRIORITY_1 through PRIORITY_5
+            key = f'priority_{i}'
+            # Get the string, falling back to empty if the key is missing
+            priority_str = notification_options.get(key, '')
+            # Split by commas OR whitespace (split() drops the empty strings), uppercasing once.
+            codes = priority_str.replace(',', ' ').upper().split()
+            # Event codes are always two letters (A-Z), see the priority lookup table.
+            valid_codes = {sys.intern(code): i for code in codes
+                           if len(code) == 2 and code.isascii() and code.isalpha()}
             
-            app_config.EVENT_PRIORITIES = event_priorities
+            for code in valid_codes:
+                if code in event_priorities:
+                    # The code already exists. Log a warning.
+                    log.warning("Duplicate event code '%s' found in configuration. It was found in both PRIORITY_%d and in PRIORITY_%d. Using the highest priority (%d).",
+                                code, event_priorities[code], i, i)
+            event_priorities.update(valid_codes)
             
-            # Parse the default priority
-            app_config.DEFAULT_PRIORITY = config.getint('Notification', 'default_priority', fallback=5)
-            if not 1 <= app_config.DEFAULT_PRIORITY <= 5:
-                log.warning("Invalid DEFAULT_PRIORITY '%d'. Must be between 1 and 5. Using default 5.", app_config.DEFAULT_PRIORITY)
-                app_config.DEFAULT_PRIORITY = 5
+            invalid_codes = [code for code in codes if code not in valid_codes]
+            if invalid_codes:
+                log.warning("In [Notification], ignoring invalid event code(s) %s in %s. Codes must be 2 letters.",
+                            ', '.join(invalid_codes), key.upper())
         
-        except ValueError:
-            log.warning("Invalid number in [Notification] section. Using default queue settings.")
-            # Defaults are already set in AppConfig, so no action needed.
-            pass
+        app_config.EVENT_PRIORITIES = event_priorities
 
     # --- Load Site and Default Sections ---
-    system_sections = ['SIA-Server', 'IP-Check', 'Logging']
-    account_sections = [s for s in config.sections() if s not in system_sections]
+    account_sections = [s for s in config.sections() if s not in SYSTEM_SECTIONS]
 
     for section_name in account_sections:
+        # Snapshot the section once, it is shared by the site name and topic parsing below.
+        options = _section_options(config, section_name)
         # The section name IS the account number, unless it's the special 'Default' section
         is_default = (section_name == 'Default')
-        account_number = 'default' if is_default else section_name
+        # Interned once here, as the account is a key of several config dicts for the
+        # life of the process. Accounts parsed from the wire are deliberately not interned.
+        account_number = 'default' if is_default else sys.intern(section_name)
         
         # Rule 1: If SITE_NAME is missing, default to the account number.
         if not is_default:
-            site_name = config.get(section_name, 'site_name', fallback=account_number)
+            site_name = options.get('site_name', account_number)
             app_config.ACCOUNT_SITES[account_number] = site_name
         
+        # Rule 2: If NTFY_ENABLED is missing or No, skip the notification settings entirely.
+        if not _get_bool(options, 'ntfy_enabled'):
+            continue
+
         # Parse notification settings for this section
-        topic_config = _parse_topic_config(config, section_name)
+        topic_config = _parse_topic_config(options, section_name)
         if topic_config:
             app_config.NTFY_TOPICS[account_number] = topic_config
+            app_config.NTFY_DISPATCH[account_number] = _build_dispatch_entry(topic_config)
         
     if not is_valid:
         log.critical("Configuration validation failed. Please check the errors above. Exiting.")
         sys.exit(1)
         
-    log.info("Configuration loaded successfully from sia-server.conf and defaults.py.")
-    return app_config
+    log.info("Configuration loaded successfully from sia-server.conf.")
+    app_config.EVENT_PRIORITY_LUT = _build_priority_lut(app_config.EVENT_PRIORITIES, app_config.DEFAULT_PRIORITY)
+    return app_config.build()
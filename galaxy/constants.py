@@ -4,10 +4,12 @@ Constants related to the Galaxy SIA Protocol.
 This file defines the known Command Bytes (the second byte of every message block)
 and their human-readable names.
 """
+from types import MappingProxyType
 
 # Defines the meaning of the second byte (Command Byte) in each message block.
 # Source: Reverse-engineered and cross-referenced with public SIA documentation.
-COMMANDS = {
+# Wrapped in a read-only MappingProxyType, as the protocol tables must never change at runtime.
+COMMANDS = MappingProxyType({
     # --- Client to Server Commands (Observed) ---
     0x23: 'ACCOUNT_ID',
     0x4E: 'NEW_EVENT',
@@ -42,17 +44,23 @@ COMMANDS = {
     0x56: 'VCHN_REQUEST',
     0x76: 'VCHN_FRAME',
     0x49: 'VIDEO',
-}
+})
 
 # Create a reverse mapping for easily sending commands by name.
 # This allows us to use 'ACKNOWLEDGE' in the code instead of the raw hex value.
-COMMAND_BYTES = {name: byte for byte, name in COMMANDS.items()}
+COMMAND_BYTES = MappingProxyType({name: byte for byte, name in COMMANDS.items()})
+
+# 256-entry tuple indexed directly by the command byte, so resolving a received
+# command is a plain index instead of a dict lookup. Bytes without a known
+# command get the same 'UNKNOWN(0x..)' name the server logs for them.
+COMMANDS_BY_BYTE = tuple(COMMANDS.get(byte, f'UNKNOWN(0x{byte:02x})') for byte in range(256))
 
 # --- SIA Event Code Translations ---
 # A human-readable description for each 2-character SIA Event Code.
 # This can be used to generate descriptive notifications for SIA Level 2 events.
 # Source: Honeywell Galaxy Flex Installer Manual & community contributions.
-EVENT_CODE_DESCRIPTIONS = {
+# Read-only like COMMANDS; lookups stay a single hash probe.
+EVENT_CODE_DESCRIPTIONS = MappingProxyType({
     # A - Alarm Cause / AC Power
     'AC': "Alarm Cause Reported",
     'AR': "AC Power Restored",
@@ -228,7 +236,7 @@ EVENT_CODE_DESCRIPTIONS = {
     'ZR': "Freezer Alarm Restored",
     'ZT': "Freezer Trouble",
     'ZU': "Freezer Unbypass",
-}
+})
 
 # ============================================
 # CHARACTER ENCODING
@@ -236,8 +244,11 @@ EVENT_CODE_DESCRIPTIONS = {
 
 # Unknown character mapping - Galaxy proprietary encoding
 # Used for mapping special language specific characters
+# All keys must be bytes >= 0x80; plain ASCII text skips the mapping entirely.
+# All values must be Latin-1 characters, as they are substituted at the byte level.
 # These are confirmed from actual captures
 # You can add more as you discover them
+# BYTE_TRANSLATE_TABLE (below) is derived from this map at import time.
 UNKNOWN_CHAR_MAP = {
     '\x8e': 'Ä',  # Confirmed in: ÅTERSTÄLL
     '\x8f': 'Å',  # Confirmed in: PÅSLAG, SYSTEMÅT
@@ -246,3 +257,9 @@ UNKNOWN_CHAR_MAP = {
     '\x84': 'ä',  # Confirmed in: username test
     '\x94': 'ö',  # Confirmed in: username test
 }
+
+# Precomputed 256-byte bytes.translate() table for UNKNOWN_CHAR_MAP, indexed
+# directly by the raw byte value. Each proprietary byte is replaced by the
+# Latin-1 byte of its real character and all other bytes map to themselves,
+# so the result decodes as iso-8859-1 in one pass with no str-level translate.
+BYTE_TRANSLATE_TABLE = bytes(ord(UNKNOWN_CHAR_MAP.get(chr(i), chr(i))) for i in range(256))
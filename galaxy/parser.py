@@ -4,17 +4,22 @@ Galaxy SIA Protocol Payload Parser
 This module is responsible for parsing the *payloads* of valid Galaxy SIA
 message blocks. It does not handle protocol framing (length, command, checksums).
 """
-import re
+import sys
 import logging
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, NamedTuple
 
 log = logging.getLogger(__name__)
 
-@dataclass
+class MessageBlock(NamedTuple):
+    """One validated message block: its command name and the clean payload."""
+    command: str
+    payload: bytes
+
+@dataclass(slots=True)
 class GalaxyEvent:
     """Structured data for a complete Galaxy SIA event."""
-    # Raw Payloads for debugging
+    # Raw Payloads for debugging (only kept when DEBUG logging is enabled)
     account_payload: Optional[bytes] = None
     data_payload: Optional[bytes] = None
     ascii_payload: Optional[bytes] = None
@@ -36,31 +41,56 @@ class GalaxyEvent:
     # Parsed from ASCII Payload
     action_text: Optional[str] = None
 
-def decode_unknown_text(data: bytes, char_map: Dict[str, str]) -> str:
+def decode_unknown_text(data: bytes, translate_table: bytes) -> str:
     """
-    Decodes text from ASCII blocks using a custom character map.
+    Decodes text from ASCII blocks using a precomputed 256-byte translate table.
     This handles the proprietary character encoding used by the Galaxy panel.
     """
-    try:
-        # 1. Decode the raw bytes into a string using a "safe" single-byte encoding.
-        # This correctly preserves all the proprietary characters like \x8e as single characters.
-        text = data.decode('iso-8859-1')
-    except Exception as e:
-        log.warning("Could not decode text data: %s", e)
-        return ""
-
-    # 2. Now, perform a simple string-to-string replacement for each known character.
-    for bad_char, good_char in char_map.items():
-        text = text.replace(bad_char, good_char)
-    
-    return text.strip()
+    # Trim the padding while it is still raw bytes, so neither path below has to
+    # copy or decode it.
+    data = data.strip()
+
+    # Fast path: the proprietary characters are all bytes >= 0x80, so plain ASCII text
+    # (the common case) needs no mapping at all.
+    if data.isascii():
+        return data.decode('ascii')
+
+    # Swap the proprietary bytes (like \x8e) for the Latin-1 bytes of the right letters
+    # in one bytes.translate() pass, then decode as iso-8859-1, which maps every byte
+    # to the character with the same ordinal and so cannot fail.
+    return data.translate(translate_table).decode('iso-8859-1')
 
 def parse_account_payload(payload: bytes, event: GalaxyEvent):
     """Parses the clean payload of an ACCOUNT_ID block."""
-    event.account_payload = payload
+    if log.isEnabledFor(logging.DEBUG):
+        event.account_payload = payload
     event.account = payload.decode('utf-8', errors='ignore')
     log.debug("Parsed account: '%s'", event.account)
 
+def _split_event_code(section: str) -> tuple[str | None, str | None]:
+    r"""
+    Splits the last data section into its event code and optional zone, e.g.
+    'BA1011' -> ('BA', '1011') and 'CL' -> ('CL', None). Same rules as the regex
+    ([A-Z]{2})(\d{3,4})?, but a few character compares instead of the regex engine.
+    """
+    if len(section) < 2 or not ('A' <= section[0] <= 'Z' and 'A' <= section[1] <= 'Z'):
+        return None, None
+    end = 2
+    while end < 6 and end < len(section) and '0' <= section[end] <= '9':
+        end += 1
+    # Fewer than 3 digits is not a zone.
+    zone = section[2:end] if end >= 5 else None
+    return section[:2], zone
+
+# Maps the 2-char identifier of a data section to the GalaxyEvent field it fills.
+_DATA_SECTION_FIELDS = {
+    'ti': 'time',       # ti11:45
+    'id': 'user_id',    # id001
+    'pi': 'partition',  # pi010
+    'ri': 'group',
+    'va': 'value',
+}
+
 def parse_data_payload(payload: bytes, event: GalaxyEvent, event_code_descriptions: Dict):
     """
     Parses the clean payload of a NEW_EVENT block (Command Byte 'N').
@@ -69,7 +99,8 @@ def parse_data_payload(payload: bytes, event: GalaxyEvent, event_code_descriptio
       - 'ti11:45/id001/pi010/CL'
       - 'ti11:46/BA1011'
     """
-    event.data_payload = payload
+    if log.isEnabledFor(logging.DEBUG):
+        event.data_payload = payload
     data_str = payload.decode('utf-8', errors='ignore')
 
     # The payload consists of sections separated by '/', the last one is special (ECzzzz).
@@ -80,21 +111,11 @@ def parse_data_payload(payload: bytes, event: GalaxyEvent, event_code_descriptio
     # Process all sections before the last one for identifiers, ti, id, pi, ri, va.
     # We loop through them one by one, but skip the last one.
     for section in sections[:-1]:
-        if section.startswith('ti'): # ti11:45
-            event.time = section[2:] # 11:45
-            log.debug("Parsed time: '%s'", event.time)
-        elif section.startswith('id'):  # id001
-            event.user_id = section[2:] # 001
-            log.debug("Parsed user_id: '%s'", event.user_id)
-        elif section.startswith('pi'):    # pi010
-            event.partition = section[2:] # 010
-            log.debug("Parsed partition: '%s'", event.partition)
-        elif section.startswith('ri'):
-            event.group = section[2:]
-            log.debug("Parsed group: '%s'", event.group)
-        elif section.startswith('va'):
-            event.value = section[2:]
-            log.debug("Parsed value: '%s'", event.value)
+        # One dict probe on the 2-char identifier, e.g. 'ti11:45' -> event.time = '11:45'
+        field_name = _DATA_SECTION_FIELDS.get(section[:2])
+        if field_name:
+            setattr(event, field_name, section[2:])
+            log.debug("Parsed %s: '%s'", field_name, section[2:])
         else:
             log.debug("Unknown data section identifier found: '%s'", section)
     
@@ -103,38 +124,39 @@ def parse_data_payload(payload: bytes, event: GalaxyEvent, event_code_descriptio
     # It may also have a 3-4 digit Zone Number appended directly to the code.
     last_section = sections[-1]
 
-    # We use regex to extract the two parts:
-    #   - Group 1: ([A-Z]{2})   -> Exactly two uppercase letters (the Event Code)
-    #   - Group 2: (\d{3,4})?  -> An optional group of 3 or 4 digits (the Zone)
-    ec_match = re.match(r'([A-Z]{2})(\d{3,4})?', last_section)
-    if ec_match:
-        event.event_code = ec_match.group(1)
+    # Split it into the two parts:
+    #   - Exactly two uppercase letters (the Event Code)
+    #   - An optional group of 3 or 4 digits (the Zone)
+    event_code, zone = _split_event_code(last_section)
+    if event_code:
+        event.event_code = sys.intern(event_code)
         log.debug("Parsed event_code: '%s'", event.event_code)
         # Look up the human-readable description for this event code.
         event.event_description = event_code_descriptions.get(event.event_code, "Unknown")
         log.debug("Mapped event description: '%s'", event.event_description)
-        # Check if the optional Zone group was found.
-        if ec_match.group(2):
-            event.zone = ec_match.group(2)
+        # Check if the optional Zone was found.
+        if zone:
+            event.zone = zone
             log.debug("Parsed zone: '%s'", event.zone)
     else:
         log.warning("Could not parse event code from last section: %s", last_section)
 
-def parse_ascii_payload(payload: bytes, event: GalaxyEvent, char_map: Dict[bytes, str]):
+def parse_ascii_payload(payload: bytes, event: GalaxyEvent, translate_table: bytes):
     """Parses the clean payload of an ASCII block."""
-    event.ascii_payload = payload
-    event.action_text = decode_unknown_text(payload, char_map)
+    if log.isEnabledFor(logging.DEBUG):
+        event.ascii_payload = payload
+    event.action_text = decode_unknown_text(payload, translate_table)
     log.debug("Parsed action_text: '%s'", event.action_text)
 
-def parse_galaxy_event(blocks: List[Dict], account_sites: Dict, 
-                      char_map: Dict, event_code_descriptions: Dict) -> GalaxyEvent:
+def parse_galaxy_event(blocks: List[MessageBlock], account_sites: Dict, 
+                      translate_table: bytes, event_code_descriptions: Dict) -> GalaxyEvent:
     """
     Parses a chunk of valid blocks into a GalaxyEvent object.
     
     Args:
-        blocks: A list of dicts, each with 'command' and a clean 'payload'.
+        blocks: A list of MessageBlocks, each with a command name and a clean payload.
         account_sites: Dict mapping account numbers to site names.
-        char_map: Custom character mapping dictionary.
+        translate_table: 256-byte table for the proprietary characters (see BYTE_TRANSLATE_TABLE).
         event_code_descriptions: Dict mapping event codes to descriptions.
         
     Returns:
@@ -142,10 +164,7 @@ def parse_galaxy_event(blocks: List[Dict], account_sites: Dict,
     """
     event = GalaxyEvent()
     
-    for block in blocks:
-        command = block['command']
-        payload = block['payload']
-        
+    for command, payload in blocks:
         if command == 'ACCOUNT_ID':
             parse_account_payload(payload, event)
             if event.account:
@@ -156,7 +175,7 @@ def parse_galaxy_event(blocks: List[Dict], account_sites: Dict,
            parse_data_payload(payload, event, event_code_descriptions)
             
         elif command == 'ASCII':
-            parse_ascii_payload(payload, event, char_map)
+            parse_ascii_payload(payload, event, translate_table)
             
         else:
             log.warning("Unknown command '%s' passed to parser. Payload: %r", command, payload)
@@ -41,37 +41,43 @@ except ImportError:
 
 # --- END INITIALIZATION ---
 
-async def handle_ip_check(reader, writer):
-    """Handles an incoming IP Check connection by echoing the received data."""
-    addr = writer.get_extra_info('peername')
-    
-    try:
-        data = await reader.read(1024)
-        if not data:
+class IPCheckProtocol(asyncio.Protocol):
+    """
+    Handles an incoming IP Check connection by echoing the received data.
+
+    A plain Protocol rather than a StreamReader/StreamWriter handler: the whole
+    exchange is one read and one write, so the callbacks do it directly without
+    the stream buffering and a coroutine per connection.
+    """
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info('peername')
+        self.echoed = False
+
+    def data_received(self, data):
+        # Only the first ping is echoed; anything after it is ignored until the panel closes.
+        if self.echoed:
             return
+        self.echoed = True
+        log.info("Received %d-byte ping from %s. Echoing response.", len(data), self.addr[0])
+        # data.hex() would be built even when DEBUG is off, so check the level first.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Ping HEX: %s", data.hex())
 
-        log.info("Received %d-byte ping from %s. Echoing response.", len(data), addr[0])
-        log.debug("Ping HEX: %s", data.hex())
-        
         # Echo the exact same data back to the panel.
-        writer.write(data)
-        await writer.drain()
+        self.transport.write(data)
 
+    def eof_received(self):
         # Wait for the panel to close the connection.
-        # Note: The panel closes the connection after 15s:
-        await reader.read(-1)
-        log.info("Panel at %r has closed the connection.", addr)
-
-    except asyncio.IncompleteReadError:
-        log.info("Panel at %r has closed the connection (IncompleteReadError).", addr)
-    except Exception as e:
-        log.error("Error in IP Check handler for %s: %s", addr[0], e)
-    finally:
-        writer.close()
-        try:
-            await writer.wait_closed()
-        except Exception:
-            pass
+        # Note: The panel closes the connection after 15s.
+        # Returning False lets the transport close our side as well.
+        return False
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            log.error("Error in IP Check handler for %s: %s", self.addr[0], exc)
+        elif self.echoed:
+            log.info("Panel at %r has closed the connection.", self.addr)
 
 async def start_ip_check_server(): # Renamed from 'main' to be an async function
     """The main async function to start the server."""
@@ -87,8 +93,9 @@ async def start_ip_check_server(): # Renamed from 'main' to be an async function
     
     # We move the try...except block here, inside the async function
     try:
-        server = await asyncio.start_server(
-            handle_ip_check, config.IP_CHECK_ADDR, config.IP_CHECK_PORT
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(
+            IPCheckProtocol, config.IP_CHECK_ADDR, config.IP_CHECK_PORT
         )
     except OSError as e:
         # This is the same robust error handling from the main server
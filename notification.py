@@ -5,10 +5,13 @@ This module is responsible for formatting and sending notifications
 to a service like ntfy.sh based on a parsed GalaxyEvent.
 """
 
+import heapq
+import itertools
 import logging
+import random
 import sys
 import time
-from typing import Dict
+from typing import Dict, Sequence
 from queue import Queue, Full as QueueFull, Empty
 from threading import Thread, Event as ThreadEvent
 from galaxy.parser import GalaxyEvent
@@ -49,9 +52,11 @@ except ImportError:
     sys.exit(1) # Exit the entire application immediately.
 
 
-def get_event_priority(event_code: str, priority_map: Dict, default_priority: int) -> int:
-    """Gets the notification priority for a given event code from the defaults map."""
-    return priority_map.get(event_code, default_priority)
+def get_event_priority(event_code: str, priority_lut: Sequence[int], default_priority: int) -> int:
+    """Gets the notification priority for a given event code from the 26*26 priority lookup table."""
+    if len(event_code) == 2 and 'A' <= event_code[0] <= 'Z' and 'A' <= event_code[1] <= 'Z':
+        return priority_lut[(ord(event_code[0]) - 65) * 26 + (ord(event_code[1]) - 65)]
+    return default_priority
 
 
 def format_notification_text(event: GalaxyEvent) -> str:
@@ -63,40 +68,41 @@ def format_notification_text(event: GalaxyEvent) -> str:
     # Use a more descriptive name to avoid shadowing the 'time' module.
     event_time = event.time or "??"
     
+    # Collect the parts and join them once at the end.
+    parts = [event_time]
+
     # If we have the rich text from the ASCII block, use it (SIA Level 3+)
     if event.action_text:
-        notification = f"{event_time} {event.action_text}"
+        parts.append(event.action_text)
         # Add zone info if it was parsed separately and isn't already in the text
-        if event.zone and event.zone not in str(event.action_text):
-            notification += f" (Zone {event.zone})"
+        if event.zone and event.zone not in event.action_text:
+            parts.append(f"(Zone {event.zone})")
     # Otherwise, build a basic message from the Data block fields (SIA Level 2)
     else:
-        notification = f"{event_time}"
         if event.event_code:
-            notification += f" Event: {event.event_code} ({event.event_description})"
+            parts.append(f"Event: {event.event_code} ({event.event_description})")
         if event.user_id:
-            notification += f" User: {event.user_id}"
+            parts.append(f"User: {event.user_id}")
         if event.zone:
-            notification += f" Zone: {event.zone}"
+            parts.append(f"Zone: {event.zone}")
         if event.partition:
-            notification += f" Partition: {event.partition}"
+            parts.append(f"Partition: {event.partition}")
     
-    return notification.strip()
+    return " ".join(parts).strip()
 
 
-def _dispatch_http_notification(event: GalaxyEvent, ntfy_topics: Dict, priority_map: Dict, 
-                               default_priority: int) -> bool:
+def _dispatch_http_notification(session: requests.Session, event: GalaxyEvent, ntfy_dispatch: Dict,
+                               priority_lut: Sequence[int], default_priority: int) -> bool:
     """Sends a formatted notification using topic-specific configuration."""
     
-    # 1. Find the correct topic configuration for this event's account.
-    topic_config = ntfy_topics.get(event.account, ntfy_topics.get('default'))
-    
-    # 2. Check if notifications are enabled for this specific topic.
-    if not topic_config or not topic_config.get('enabled', False):
+    # 1. Find the correct (url, title, auth header) entry for this event's account.
+    # Only enabled topics are present in the dispatch table.
+    dispatch_entry = ntfy_dispatch.get(event.account) or ntfy_dispatch.get('default')
+    if dispatch_entry is None:
         log.debug("Notifications disabled for account '%s' or default topic. Skipping.", event.account)
         return False
         
-    ntfy_url = topic_config.get('url')
+    ntfy_url, notification_title, auth_header = dispatch_entry
     if not ntfy_url or 'your-topic-here' in ntfy_url:
         log.warning("No valid ntfy.sh URL found for account '%s' or default. Skipping.", event.account)
         return False
@@ -106,10 +112,9 @@ def _dispatch_http_notification(event: GalaxyEvent, ntfy_topics: Dict, priority_
         return False
 
     message = format_notification_text(event)
-    priority = get_event_priority(event.event_code, priority_map, default_priority)
+    priority = get_event_priority(event.event_code, priority_lut, default_priority)
     
-    # 3. Get the title from the topic's specific configuration.
-    notification_title = topic_config.get('title', 'Galaxy Alarm')
+    # 2. The title comes from the topic's specific configuration.
     account_display = event.site_name or event.account
     title = f"{notification_title}: {account_display}"
     
@@ -118,22 +123,10 @@ def _dispatch_http_notification(event: GalaxyEvent, ntfy_topics: Dict, priority_
         "Priority": str(priority),
     }
     
-    auth_config = topic_config.get('auth')
-    auth_details = None
-    if auth_config:
+    # 3. The Authorization header (Bearer or Basic) was already built at config load.
+    if auth_header:
+        headers['Authorization'] = auth_header
         log.debug("ntfy.sh authentication is configured for this topic.")
-        method = auth_config.get('method')
-        if method == 'token':
-            token = auth_config.get('token')
-            if token:
-                headers['Authorization'] = f"Bearer {token}"
-                log.debug("Using Bearer token authentication.")
-        elif method == 'userpass':
-            user = auth_config.get('user')
-            password = auth_config.get('pass')
-            if user and password:
-                auth_details = (user, password)
-                log.debug("Using username/password authentication.")
 
     # Two separate log lines are intentional: INFO gives the clean operational message
     # without the URL (privacy), DEBUG includes the URL for diagnostics.
@@ -143,12 +136,11 @@ def _dispatch_http_notification(event: GalaxyEvent, ntfy_topics: Dict, priority_
     log.info("Sending notification (priority %d) for account %s: %s", priority, account_display, message)
     
     try:
-        response = requests.post(
+        response = session.post(
             ntfy_url,
             data=message.encode('utf-8'),
             headers=headers,
-            timeout=10,
-            auth=auth_details
+            timeout=10
         )
         response.raise_for_status()
         log.debug("Dispatch successful for account %s.", event.account)
@@ -166,22 +158,32 @@ class NotificationDispatcher(Thread):
     A non-blocking background thread that processes a queue of notifications.
     It handles sending and retries with progressive backoff without blocking the queue.
     """
-    def __init__(self, queue: Queue, ntfy_topics: Dict, priority_map: Dict, 
+    def __init__(self, queue: Queue, ntfy_dispatch: Dict, priority_lut: Sequence[int],
                  default_priority: int, max_retries: int, max_retry_time: int):
         super().__init__(daemon=True)
         self.name = "NotificationDispatcher"
         self.queue = queue
-        self.ntfy_topics = ntfy_topics
-        self.priority_map = priority_map
+        self.ntfy_dispatch = ntfy_dispatch
+        self.priority_lut = priority_lut
         self.default_priority = default_priority
         self.max_retries = max_retries
         self.max_retry_time_minutes = max_retry_time
         self.shutdown_event = ThreadEvent()
+        # One keep-alive session for the lifetime of the thread, so a burst of events
+        # reuses the pooled TCP/TLS connection instead of a new handshake per event.
+        # Only this thread sends, so the session is never shared between threads.
+        self.session = requests.Session()
+        # Failed notifications wait here, ordered by their next attempt time, so new events
+        # are never held up behind them and nothing polls while they wait.
+        self.retry_heap = []
+        self.retry_sequence = itertools.count()
 
     def get_retry_delay(self, retry_count: int) -> int:
         """
         Calculates the retry delay using a progressive backoff strategy (exponential backoff).
-        The delay doubles with each retry, up to the configured maximum.
+        The delay doubles with each retry, up to the configured maximum, and is then
+        randomized between half and all of that ("jitter") so events that failed together
+        during an outage don't all retry at the same moment.
         """
         # Start with a 1-minute base delay
         base_delay = 1 # in minutes
@@ -193,53 +195,60 @@ class NotificationDispatcher(Thread):
         # Ensure the delay does not exceed the user-configured maximum
         final_delay = min(current_delay, self.max_retry_time_minutes)
         
-        return final_delay * 60 # Convert minutes to seconds
+        return int(final_delay * 60 * random.uniform(0.5, 1.0)) # Convert minutes to seconds
 
     def run(self):
         log.info("NotificationDispatcher thread started.")
         while not self.shutdown_event.is_set():
-            event, retry_count, next_attempt_time = self.queue.get()
-            if not event: # This is the shutdown signal
+            # Send the earliest scheduled retry first, once it is due.
+            now = time.time()
+            if self.retry_heap and self.retry_heap[0][0] <= now:
+                _, _, event, retry_count = heapq.heappop(self.retry_heap)
+                self.dispatch(event, retry_count)
+                continue
+
+            # Otherwise block until a new event arrives or the earliest retry falls due.
+            timeout = self.retry_heap[0][0] - now if self.retry_heap else None
+            try:
+                event = self.queue.get(timeout=timeout)
+            except Empty:
+                continue
+            if event is None: # This is the shutdown signal
                 self.queue.task_done()
                 break
 
-            current_time = time.time()
-
-            if current_time < next_attempt_time:
-                # It's not time to retry this item yet.
-                # Put it back at the end of the queue and immediately process the next item.
-                self.queue.put((event, retry_count, next_attempt_time))
-                self.queue.task_done()
-                # Sleep for a short time to prevent a tight loop if all items are in a wait state.
-                time.sleep(1.0) 
-                continue
-            
-            success = _dispatch_http_notification(event, self.ntfy_topics, self.priority_map, self.default_priority)
-            
-            if not success:
-                # The notification failed. Schedule it for a future retry.
-                retry_count += 1
-                if self.max_retries == 0 or retry_count <= self.max_retries:
-                    delay = self.get_retry_delay(retry_count)
-                    new_next_attempt_time = time.time() + delay
-                    log.warning("Dispatch failed for account %s. Re-queueing for retry in %d mins (attempt %d).",
-                                event.account, delay // 60, retry_count)
-                    
-                    try:
-                        self.queue.put_nowait((event, retry_count, new_next_attempt_time))
-                    except QueueFull:
-                        log.error("Queue is full. Cannot re-queue failed notification for %s.", event.account)
-                else:
-                    log.error("Dispatch failed for account %s after %d retries. Giving up.",
-                              event.account, self.max_retries)
-            
+            self.dispatch(event, 0)
             self.queue.task_done()
+        self.session.close()
         log.info("NotificationDispatcher thread stopped.")
 
+    def dispatch(self, event: GalaxyEvent, retry_count: int):
+        """Sends one notification and schedules a retry if it fails."""
+        success = _dispatch_http_notification(self.session, event, self.ntfy_dispatch,
+                                              self.priority_lut, self.default_priority)
+        if success:
+            return
+
+        # The notification failed. Schedule it for a future retry.
+        retry_count += 1
+        if self.max_retries == 0 or retry_count <= self.max_retries:
+            if self.queue.maxsize > 0 and len(self.retry_heap) >= self.queue.maxsize:
+                log.error("Queue is full. Cannot re-queue failed notification for %s.", event.account)
+                return
+            delay = self.get_retry_delay(retry_count)
+            log.warning("Dispatch failed for account %s. Re-queueing for retry in %d secs (attempt %d).",
+                        event.account, delay, retry_count)
+            # The sequence number keeps retries due at the same time in order and
+            # means the events themselves are never compared.
+            heapq.heappush(self.retry_heap, (time.time() + delay, next(self.retry_sequence), event, retry_count))
+        else:
+            log.error("Dispatch failed for account %s after %d retries. Giving up.",
+                      event.account, self.max_retries)
+
     def stop(self):
         log.info("Stopping NotificationDispatcher thread...")
         self.shutdown_event.set()
-        self.queue.put((None, 0, 0)) # Unblock the .get() call
+        self.queue.put(None) # Unblock the .get() call
 
 
 # --- This is the function that sia-server will call ---
@@ -250,15 +259,14 @@ def enqueue_notification(event: GalaxyEvent, queue: Queue):
     """
     if queue.full():
         try:
-            oldest_event, _, _ = queue.get_nowait()
+            queue.get_nowait()
             log.warning("Notification queue is full. Dropping the oldest event to make space for the new one.")
             queue.task_done()
         except Empty:
             pass
             
     try:
-        # A new event is always ready to be sent immediately (next_attempt_time = 0)
-        queue.put_nowait((event, 0, 0)) # event, retry_count, next_attempt_time
+        queue.put_nowait(event)
         log.debug("Event for account %s added to notification queue.", event.account)
     except QueueFull:
         log.error("Notification queue is still full! Event for %s was lost.", event.account)
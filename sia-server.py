@@ -120,9 +120,9 @@ except ImportError:
     pass
 
 
-from galaxy.parser import parse_galaxy_event
+from galaxy.parser import MessageBlock, parse_galaxy_event
 from notification import NotificationDispatcher, enqueue_notification
-from galaxy.constants import COMMANDS, COMMAND_BYTES, EVENT_CODE_DESCRIPTIONS
+from galaxy.constants import COMMANDS_BY_BYTE, COMMAND_BYTES, EVENT_CODE_DESCRIPTIONS
 
 # --- END INITIALIZATION ---
 
@@ -152,8 +152,8 @@ def validate_and_strip(data: bytes) -> tuple[int, bytes] | tuple[None, None]:
     return command_byte, payload
 
 
-async def build_and_send(writer, command: str, payload: bytes = b''):
-    """Builds and sends a valid Galaxy message block."""
+def build_frame(command: str, payload: bytes = b'') -> bytes:
+    """Builds a valid Galaxy message block (length, command, payload and checksum)."""
     command_byte = COMMAND_BYTES[command]
     payload_length = len(payload)
     length_byte = payload_length + 0x40
@@ -161,22 +161,55 @@ async def build_and_send(writer, command: str, payload: bytes = b''):
     checksum = 0xFF
     for byte in message_part:
         checksum ^= byte
-    final_message = message_part + bytes([checksum])
+    return message_part + bytes([checksum])
+
+
+# The replies the server sends have no payload, so their blocks never change. Build them once.
+_EMPTY_FRAMES = {command: build_frame(command) for command in ('ACKNOWLEDGE', 'REJECT')}
+
+
+async def build_and_send(writer, command: str, payload: bytes = b''):
+    """Builds and sends a valid Galaxy message block."""
+    final_message = None if payload else _EMPTY_FRAMES.get(command)
+    if final_message is None:
+        final_message = build_frame(command, payload)
     writer.write(final_message)
     await writer.drain()
     log.debug("Sent Command: %s, Raw: %r", command, final_message)
 
 
+# How long to wait for the rest of a block that arrived split over several TCP segments.
+BLOCK_READ_TIMEOUT = 2.0
+
+async def read_block(reader) -> bytes:
+    """
+    Reads one message block. TCP may deliver a block in pieces, so keep reading until
+    the length byte is satisfied. If the rest does not arrive in time, return what we
+    have and let validate_and_strip() reject it as before.
+    """
+    data = await reader.read(1024)
+    while data and data[0] >= 0x40 and len(data) < data[0] - 0x40 + 3:
+        try:
+            more = await asyncio.wait_for(reader.read(1024), timeout=BLOCK_READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            break
+        if not more:
+            break
+        data += more
+    return data
+
+
 async def handle_connection(notification_queue: Queue, reader, writer):
     """Handle an incoming SIA connection."""
     addr = writer.get_extra_info('peername')
     log.info("Connection from %r", addr)
     
-    valid_blocks = []
+    # Valid blocks, already grouped into events as they arrive: each ACCOUNT_ID starts a new event.
+    event_chunks = []
     
     try:
         while True:
-            data = await reader.read(1024)
+            data = await read_block(reader)
             if not data:
                 log.info("Connection closed by peer")
                 break
@@ -200,29 +233,20 @@ async def handle_connection(notification_queue: Queue, reader, writer):
                     await build_and_send(writer, 'REJECT')
                     continue
             
-            command_name = COMMANDS.get(command_byte, f'UNKNOWN(0x{command_byte:02x})')
+            command_name = COMMANDS_BY_BYTE[command_byte]
             log.debug("Received Command: %s, Payload: %r", command_name, payload)
             if command_name != 'END_OF_DATA':
-                valid_blocks.append({'command': command_name, 'payload': payload})
+                if command_name == 'ACCOUNT_ID' or not event_chunks:
+                    event_chunks.append([])
+                event_chunks[-1].append(MessageBlock(command_name, payload))
             await build_and_send(writer, 'ACKNOWLEDGE')
             
             if command_name == 'END_OF_DATA':
                 log.debug("End of data received, processing sequence.")
                 break
         
-        if not valid_blocks:
+        if not event_chunks:
             return
-            
-        event_chunks = []
-        current_chunk = []
-        for block in valid_blocks:
-            if block['command'] == 'ACCOUNT_ID' and current_chunk:
-                event_chunks.append(current_chunk)
-                current_chunk = [block]
-            else:
-                current_chunk.append(block)
-        if current_chunk:
-            event_chunks.append(current_chunk)
         
         log.info("Found %d distinct event(s) in this connection", len(event_chunks))
         for i, chunk in enumerate(event_chunks, 1):
@@ -231,7 +255,7 @@ async def handle_connection(notification_queue: Queue, reader, writer):
             event = parse_galaxy_event(
                 chunk,
                 config.ACCOUNT_SITES,
-                config.UNKNOWN_CHAR_MAP,
+                config.BYTE_TRANSLATE_TABLE,
                 EVENT_CODE_DESCRIPTIONS
             )
             
@@ -318,10 +342,21 @@ async def start_servers(notification_queue: Queue):
     
     log.info('='*60)
     
-    # Run the main SIA server forever
+    # Run the main SIA server until a shutdown signal arrives. The handlers run inside the
+    # event loop, so the finally block below always gets to close the server and the subprocess.
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, request_shutdown, sig, stop_event)
+        except NotImplementedError:
+            # Not available on Windows; the signal.signal() handlers set in main() apply there.
+            break
+
     try:
-        await sia_server.serve_forever()
+        await stop_event.wait()
     finally:
+        sia_server.close()
         # When the main server is shut down, also terminate the subprocess
         if ip_check_process and ip_check_process.returncode is None:
             log.info("Terminating IP Check server subprocess...")
@@ -329,6 +364,11 @@ async def start_servers(notification_queue: Queue):
             await ip_check_process.wait()
             log.info("IP Check subprocess terminated.")
 
+def request_shutdown(signum, stop_event: asyncio.Event):
+    """Signal handler run by the event loop, lets start_servers() shut down cleanly."""
+    log.info("Received shutdown signal (%d), stopping server...", signum)
+    stop_event.set()
+
 def handle_shutdown(signum, frame):
     log.info("Received shutdown signal (%d), stopping server...", signum)
     sys.exit(0)
@@ -342,8 +382,8 @@ def main():
     notification_queue = Queue(maxsize=config.MAX_QUEUE_SIZE)
     dispatcher = NotificationDispatcher(
         notification_queue,
-        config.NTFY_TOPICS,
-        config.EVENT_PRIORITIES,
+        config.NTFY_DISPATCH,
+        config.EVENT_PRIORITY_LUT,
         config.DEFAULT_PRIORITY,
         config.MAX_RETRIES,
         config.MAX_RETRY_TIME
@@ -353,6 +393,7 @@ def main():
     exit_code = 0 # Assume success
     try:
         asyncio.run(start_servers(notification_queue))
+        log.info("Server stopped")
     except (KeyboardInterrupt, SystemExit):
         log.info("Server stopped")
     except OSError as e: